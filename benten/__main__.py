@@ -5,6 +5,7 @@ import socketserver
 import pathlib
 
 from .configuration import Configuration
+from .code.yaml import c_loader_available
 
 from benten.version import __version__
 from benten.langserver.jsonrpc import JSONRPC2Connection, ReadWriter, TCPReadWriter
@@ -66,7 +67,7 @@ def main():
     logger.addHandler(handler)
 
     logger.info(f"Benten {__version__}: CWL Language Server from Rabix (Seven Bridges)")
-    logger.info(f"ruamel.yaml: {__ruamel_version__}")
+    logger.info(f"ruamel.yaml: {__ruamel_version__} (C loader: {c_loader_available()})")
     logger.info(f"cwl-format: {__cwl_fmt_version__}")
 
     config.initialize()
@@ -2,6 +2,7 @@
 
 import time
 import pathlib
+from collections import OrderedDict
 
 from .yaml import parse_yaml
 from .intelligence import Intelligence
@@ -16,6 +17,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Undo/redo, or closing and re-opening a document, brings us back to text we have
+# parsed before. We keep the last few parses around, keyed by document and text
+recent_parse_cache_size = 8
+_recent_parses = OrderedDict()
+
+
 class Document:
 
     def __init__(self,
@@ -32,15 +39,49 @@ class Document:
 
         self.problems = None
         self.code_intelligence = None
-        self.symbols = None
-        self.wf_graph = None
+        self._text_key = None
+
+        # Symbols and the workflow graph are only needed when the client asks
+        # for them, which is much less often than we parse, so we build them lazily
+        self._cwl = None
+        self._symbols = None
+        self._wf_graph = None
 
         self.update(text)
 
     def update(self, new_text):
+        # The client can send us the same text again (e.g. after a no-op format or
+        # a re-open) and there is no need to redo all the parsing in that case,
+        # unless a file it links to has changed on disk
+        text_key = (len(new_text), hash(new_text))
+        if text_key == self._text_key and not self.code_intelligence.linked_files_changed():
+            logger.debug(f"Text unchanged, skipping parse of {self.doc_uri}")
+            return
+
         self.text = new_text
+        self._symbols = None
+
+        # The parse also depends on the scratch path (ExecutionContext) and language model
+        parse_key = (self.doc_uri, self.config, id(self.type_dicts)) + text_key
+        recent = _recent_parses.get(parse_key)
+        if recent is not None and not recent[0].linked_files_changed():
+            logger.debug(f"Reusing earlier parse of {self.doc_uri}")
+            _recent_parses.move_to_end(parse_key)
+            self.code_intelligence, self.problems, self._cwl, _ = recent
+            self._text_key = text_key
+            return
+
+        self._parse_text()
+        self._text_key = text_key
+
+        # Holding on to type_dicts means its id can't be reused while the entry is alive
+        _recent_parses[parse_key] = (self.code_intelligence, self.problems, self._cwl, self.type_dicts)
+        if len(_recent_parses) > recent_parse_cache_size:
+            _recent_parses.popitem(last=False)
+
+    def _parse_text(self):
         self.code_intelligence = Intelligence()
-        self.symbols = []
+        self._cwl = None
 
         t0 = time.time()
         cwl, self.problems = parse_yaml(self.text)
@@ -58,7 +99,19 @@ class Document:
         t3 = time.time()
         logger.debug(f"Took {t3 - t2:1.3}s to parse {self.doc_uri}")
 
-        self.symbology(cwl)
+        self._cwl = cwl
+
+    @property
+    def symbols(self):
+        if self._symbols is None:
+            self.symbology(self._cwl)
+        return self._symbols
+
+    @property
+    def wf_graph(self):
+        if self._symbols is None:
+            self.symbology(self._cwl)
+        return self._wf_graph
 
     def definition(self, loc: Position):
         de = self.code_intelligence.get_doc_element(loc)
@@ -94,6 +147,11 @@ class Document:
             problems=self.problems)
 
     def symbology(self, cwl):
+        if cwl is None:
+            # We keep the last good graph while the document does not parse
+            self._symbols = []
+            return
+
         line_count = self.text.count("\n")
 
         symbols = {}
@@ -104,5 +162,5 @@ class Document:
             if _typ == "Workflow":
                 symbols = extract_step_symbols(cwl, symbols)
 
-        self.symbols = list(symbols.values())
-        self.wf_graph = cwl_graph(cwl)
+        self._symbols = list(symbols.values())
+        self._wf_graph = cwl_graph(cwl)
@@ -9,10 +9,11 @@ For details see ../../docs/document-model.md
 
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
-from typing import List
+from typing import Dict, List
 import pathlib
 
 from ..langserver.lspobjects import (Position, Range, CompletionItem, Hover)
+from ..cwl.lib import file_stamp
 from .executioncontext import ExecutionContext
 
 import logging
@@ -20,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 
 class LookupNode:
+    # We create one of these for most keys and values in the document on every parse
+    __slots__ = ("loc", "intelligence_node")
 
     def __init__(self, loc: Range):
         self.loc = loc
@@ -51,12 +54,25 @@ class Intelligence:
 
     def __init__(self):
         self.lookup_table: List[LookupNode] = []
+        # line -> lookup nodes covering that line, in lookup_table order. Built on demand
+        self._line_index: Dict[int, List[LookupNode]] = None
         self.type_defs = {}
         self.namespaces = {}
         self.execution_context: ExecutionContext = None
+        # The top level workflow, if any
+        self.workflow: 'Workflow' = None
+        # Linked files this parse depends on -> file_stamp when we read them
+        self.linked_files: Dict[pathlib.Path, tuple] = {}
 
     def add_lookup_node(self, node: LookupNode):
         self.lookup_table.append(node)
+        self._line_index = None
+
+    def add_linked_file(self, path: pathlib.Path):
+        self.linked_files[path] = file_stamp(path)
+
+    def linked_files_changed(self):
+        return any(file_stamp(path) != stamp for path, stamp in self.linked_files.items())
 
     def load_namespaces(self, cwl: dict):
         if "$namespaces" in cwl:
@@ -73,12 +89,21 @@ class Intelligence:
         self.execution_context.set_expression_lib(expression_lib)
 
     def get_doc_element(self, loc: Position):
-        # O(n) algorithm, but should do fine for our file sizes
         # For now doing exact matches on lines, which is sufficient
-        for n in self.lookup_table:
-            if n.loc.start.line <= loc.line <= n.loc.end.line:
-                if loc.line > n.loc.start.line or loc.character >= n.loc.start.character:
-                    if loc.line < n.loc.end.line or loc.character <= n.loc.end.character:
-                        return n.intelligence_node
+        if self._line_index is None:
+            self._index_lookup_table()
+
+        for n in self._line_index.get(loc.line, []):
+            if loc.line > n.loc.start.line or loc.character >= n.loc.start.character:
+                if loc.line < n.loc.end.line or loc.character <= n.loc.end.character:
+                    return n.intelligence_node
 
         return None
+
+    def _index_lookup_table(self):
+        # Almost all lookup nodes sit on a single line, so this is O(n) and turns
+        # each query from a scan of the whole table into a dict lookup
+        self._line_index = {}
+        for n in self.lookup_table:
+            for line in range(n.loc.start.line, n.loc.end.line + 1):
+                self._line_index.setdefault(line, []).append(n)
@@ -15,22 +15,36 @@ step information.
 
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
-from typing import Dict
+import sys
+from functools import partial
+from typing import Callable, Dict, Iterable, Set, Tuple
 
 from ..cwl.lib import (get_range_for_value, list_as_map, ListOrMap, normalize_source)
 from .intelligence import IntelligenceNode, CompletionItem
-from ..langserver.lspobjects import Diagnostic, DiagnosticSeverity
+from ..langserver.lspobjects import Diagnostic, DiagnosticSeverity, Range
 
 
 import logging
 logger = logging.getLogger(__name__)
 
 
+# Step and port ids are short strings that we keep in sets and compare against
+# over and over. Interning them means equal ids are mostly the same object, which
+# saves memory and lets string comparison short circuit. sys.intern only takes
+# exact str (YAML keys can come back as str subclasses) so we leave others be
+def _intern(_id):
+    return sys.intern(_id) if type(_id) is str else _id
+
+
+def _intern_all(ids: Iterable) -> set:
+    return {_intern(_id) for _id in ids}
+
+
 # TODO: Use typed objects for ports to check types
 class StepInterface:
     def __init__(self, inputs=None, outputs=None):
-        self.inputs = inputs or set()
-        self.outputs = outputs or set()
+        self.inputs = _intern_all(inputs or ())
+        self.outputs = _intern_all(outputs or ())
 
 
 class Workflow:
@@ -40,10 +54,18 @@ class Workflow:
         self._steps = steps
 
         self.step_intels: Dict[str, WFStepIntelligence] = {}
-        self.wf_inputs = set(list_as_map(inputs, key_field="id", problems=[]).keys())
-        self.wf_outputs = set(list_as_map(outputs, key_field="id", problems=[]).keys())
+        # (step_id, port_id) for every step output, built once all steps are in
+        self.step_sources: Set[Tuple[str, str]] = set()
+        self.wf_inputs = _intern_all(list_as_map(inputs, key_field="id", problems=[]).keys())
+        self.wf_outputs = _intern_all(list_as_map(outputs, key_field="id", problems=[]).keys())
 
     def validate_connections(self, problems):
+        self.step_sources = {
+            (step_id, port_id)
+            for step_id, step_intel in self.step_intels.items()
+            for port_id in step_intel.step_interface.outputs
+        }
+
         unused_ports = set(self.wf_inputs)
         self.validate_step_connections(unused_ports, problems)
         self.validate_outputs(unused_ports, problems)
@@ -55,7 +77,7 @@ class Workflow:
             _validate_source(
                 port=output,
                 src_key="outputSource",
-                value_range=outputs.get_range_for_value(output_id),
+                get_value_range=partial(outputs.get_range_for_value, output_id),
                 step_id=None,
                 workflow=self,
                 unused_ports=unused_ports,
@@ -73,18 +95,17 @@ class Workflow:
 
     def flag_unused_inputs(self, unused_ports, problems):
         inputs = ListOrMap(self._inputs, key_field="id", problems=[])
-        for inp in unused_ports:
-            if inp in inputs.as_dict:
-                problems += [
-                    Diagnostic(
-                        _range=inputs.get_range_for_id(inp),
-                        message=f"Unused input",
-                        severity=DiagnosticSeverity.Warning)
-                ]
+        for inp in unused_ports.intersection(inputs.as_dict):
+            problems += [
+                Diagnostic(
+                    _range=inputs.get_range_for_id(inp),
+                    message=f"Unused input",
+                    severity=DiagnosticSeverity.Warning)
+            ]
 
     def add_step_intel(self, step_id, step_intel: 'WFStepIntelligence'):
         step_intel.workflow = self
-        self.step_intels[step_id] = step_intel
+        self.step_intels[_intern(step_id)] = step_intel
 
     def get_step_intel(self, step_id):
         return self.step_intels.get(step_id)
@@ -96,7 +117,7 @@ class Workflow:
 class WFStepIntelligence:
     def __init__(self, step_id):
         super().__init__()
-        self.step_id = step_id
+        self.step_id = _intern(step_id)
         self.step_interface: StepInterface = StepInterface()
         self.workflow = None
 
@@ -123,7 +144,7 @@ class WFStepIntelligence:
                 _validate_source(
                     port=port,
                     src_key="source",
-                    value_range=inputs.get_range_for_value(port_id),
+                    get_value_range=partial(inputs.get_range_for_value, port_id),
                     step_id=self.step_id,
                     workflow=self.workflow,
                     unused_ports=unused_ports,
@@ -163,7 +184,7 @@ class PortSourceCompleterBase(IntelligenceNode):
                 if _id != step_id
             ]
         else:
-            src_step, src_port = self.prefix.split("/")
+            src_step, _, src_port = self.prefix.partition("/")
             step_intel = workflow.step_intels.get(src_step)
             if step_intel is not None:
                 return [
@@ -197,17 +218,20 @@ def parse_step_interface(run_field: dict, problems: list):
 
     if isinstance(run_field, dict):
         step_interface = StepInterface(
-            inputs=set(list_as_map(run_field.get("inputs"),
-                                   key_field="id",
-                                   problems=problems).keys()),
-            outputs=set(list_as_map(run_field.get("outputs"),
-                                    key_field="id",
-                                    problems=problems).keys()))
+            inputs=list_as_map(run_field.get("inputs"),
+                               key_field="id",
+                               problems=problems).keys(),
+            outputs=list_as_map(run_field.get("outputs"),
+                                key_field="id",
+                                problems=problems).keys())
 
     return step_interface
 
 
-def _validate_source(port, src_key, value_range, step_id, workflow, unused_ports, problems):
+# Computing ranges is not free (it stringifies the value) and we only need them
+# to report a problem, so we pass around a function that computes the range
+def _validate_source(port, src_key, get_value_range: Callable[[], Range],
+                     step_id, workflow, unused_ports, problems):
 
     src = None
     if isinstance(port, (str, list)):
@@ -215,19 +239,21 @@ def _validate_source(port, src_key, value_range, step_id, workflow, unused_ports
     elif isinstance(port, dict):
         if src_key in port:
             src = port.get(src_key)
-            value_range = get_range_for_value(port, src_key)
+            get_value_range = partial(get_range_for_value, port, src_key)
 
     if src is None:
         return
 
     if isinstance(src, list):
         for n, _src in enumerate(src):
-            _validate_one_source(_src, get_range_for_value(src, n), step_id, workflow, unused_ports, problems)
+            _validate_one_source(
+                _src, partial(get_range_for_value, src, n), step_id, workflow, unused_ports, problems)
     elif isinstance(src, str):
-        _validate_one_source(src, value_range, step_id, workflow, unused_ports, problems)
+        _validate_one_source(src, get_value_range, step_id, workflow, unused_ports, problems)
 
 
-def _validate_one_source(src, value_range, step_id, workflow, unused_ports, problems):
+def _validate_one_source(src, get_value_range: Callable[[], Range],
+                         step_id, workflow, unused_ports, problems):
 
     if src is None:
         return
@@ -239,21 +265,26 @@ def _validate_one_source(src, value_range, step_id, workflow, unused_ports, prob
     if src in workflow.wf_inputs:
         return
 
-    err_msg = f"No such workflow input. Expecting one of {workflow.wf_inputs}"
-
     if isinstance(src, str) and "/" in src:
-        src_step, src_port = src.split("/")
-        err_msg = "Port can not connect to same step"
-        if src_step != step_id:
+        src_step, _, src_port = src.partition("/")
+        if src_step != step_id and (src_step, src_port) in workflow.step_sources:
+            return
+
+        # Error path: only now do we work out what went wrong
+        if src_port == "":
+            err_msg = f"Missing port name after {src_step}/"
+        elif src_step == step_id:
+            err_msg = "Port can not connect to same step"
+        elif src_step in workflow.step_intels:
+            err_msg = f"{src_step} has no port called {src_port}"
+        else:
             err_msg = f"No step called {src_step}"
-            if src_step in workflow.step_intels:
-                err_msg = f"{src_step} has no port called {src_port}"
-                if src_port in workflow.step_intels[src_step].step_interface.outputs:
-                    return
+    else:
+        err_msg = f"No such workflow input. Expecting one of {workflow.wf_inputs}"
 
     problems += [
         Diagnostic(
-            _range=value_range,
+            _range=get_value_range(),
             message=err_msg,
             severity=DiagnosticSeverity.Error)
     ]
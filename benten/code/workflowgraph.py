@@ -78,4 +78,4 @@ def _get_source_step(v, key):
     src = v.get(key) if isinstance(v, dict) else v
     if not isinstance(src, list):
         src = [src]
-    return [normalize_source(s).split("/")[0] for s in src if isinstance(s, str)]
+    return [normalize_source(s).partition("/")[0] for s in src if isinstance(s, str)]
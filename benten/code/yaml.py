@@ -2,6 +2,7 @@
 
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
+import threading
 from typing import Tuple, List
 
 from ruamel.yaml import YAML
@@ -16,22 +17,44 @@ from ..langserver.lspobjects import Diagnostic, DiagnosticSeverity, Range, Posit
 import logging
 logger = logging.getLogger(__name__)
 
+# We need line numbers for the document being edited, so this has to be the
+# pure Python round trip loader
 _yaml_loader = YAML(typ="rt")
 # TODO: allow checking for duplicate keys, perhaps with self healing
 _yaml_loader.allow_duplicate_keys = True
 
+# Linked files only need the data. The safe loader uses the libyaml based
+# C parser, which is several times faster, when ruamel.yaml.clib is installed
 fast_load = YAML(typ='safe')
 fast_load.indent(mapping=2, sequence=4, offset=2)
 fast_load.default_flow_style = False
 
 
+yaml_load_errors = (ParserError, ScannerError, ComposerError)
+
+# A YAML instance holds on to its reader, scanner and parser while loading, so it can
+# not be shared between threads (linked files are loaded from a thread pool)
+_per_thread = threading.local()
+
+
+def fast_loader() -> YAML:
+    loader = getattr(_per_thread, "fast_load", None)
+    if loader is None:
+        loader = _per_thread.fast_load = YAML(typ='safe')
+    return loader
+
+
 def fast_yaml_load(txt):
     try:
-        return fast_load.load(txt)
-    except (ParserError, ScannerError) as e:
+        return fast_loader().load(txt)
+    except yaml_load_errors as e:
         pass
 
 
+def c_loader_available():
+    return fast_load.Parser.__name__ == "CParser"
+
+
 def yaml_to_string(v: dict):
     s = StringIO()
     fast_load.dump(v, s)
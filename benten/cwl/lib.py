@@ -1,12 +1,17 @@
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
+import functools
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
 import urllib.request
 import urllib.error
 
 from ..langserver.lspobjects import Diagnostic, DiagnosticSeverity, Range, Position
-from ..code.yaml import fast_yaml_load
+from ..code.yaml import fast_loader, fast_yaml_load, yaml_load_errors
+
+import logging
+logger = logging.getLogger(__name__)
 
 
 def get_range_for_key(parent, key):
@@ -41,12 +46,16 @@ def get_range_for_value(node, key):
 
 
 class ListOrMap:
+    """We wrap the same lists many times over per parse (type parse, connection
+    validation, graph), often only to iterate over them, so ranges for ids are
+    computed on demand rather than up front"""
 
     def __init__(self, node, key_field, problems):
         self.was_dict = None
         self.as_dict = {}
         self.original_obj = node
         self.key_ids = {}
+        self.key_fields = {}
         self.map_key_to_idx = {}
         if isinstance(node, dict):
             self.as_dict = node
@@ -58,7 +67,7 @@ class ListOrMap:
                     key = _item.get(key_field)
                     if key is not None:
                         self.as_dict[key] = _item
-                        self.key_ids[key] = get_range_for_value(_item, key_field)
+                        self.key_fields[key] = key_field
                         self.map_key_to_idx[key] = n
                         continue
 
@@ -67,7 +76,7 @@ class ListOrMap:
                     if "$import" in _item:
                         key = "class"
                         self.as_dict[key] = _item
-                        self.key_ids[key] = get_range_for_value(_item, "$import")
+                        self.key_fields[key] = "$import"
                         self.map_key_to_idx[key] = n
                         continue
 
@@ -82,6 +91,8 @@ class ListOrMap:
         if self.was_dict:
             return get_range_for_key(self.as_dict, key)
         else:
+            if key not in self.key_ids:
+                self.key_ids[key] = get_range_for_value(self.as_dict[key], self.key_fields[key])
             return self.key_ids[key]
 
     def get_range_for_value(self, key):
@@ -150,12 +161,74 @@ def validate_and_load_linked_file(doc_uri: str, path: str, loc: Range, problems:
                 severity=DiagnosticSeverity.Error)
         ]
     else:
-        contents = linked_file.open("r").read()
-        node_dict = fast_yaml_load(contents)
+        contents, node_dict = load_linked_file(linked_file)
 
     return linked_file, contents, node_dict
 
 
+# Every edit of a workflow re-parses all the files linked to by the steps. These rarely
+# change, so we keep the parsed file around until it is modified on disk.
+# The returned node_dict is shared, so callers must treat it as read-only.
+def load_linked_file(path: pathlib.Path) -> (str, dict):
+    st = path.stat()
+    try:
+        result = _load_linked_file(str(path), st.st_mtime_ns, st.st_size)
+    except yaml_load_errors:
+        # Not cached, so we try again next time rather than holding on to a failed load
+        return path.open("r").read(), None
+
+    _loaded_stamps[str(path)] = (st.st_mtime_ns, st.st_size)
+    return result
+
+
+def file_stamp(path: pathlib.Path):
+    try:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+# YAML errors propagate out of here, which keeps them out of the cache
+@functools.lru_cache(maxsize=256)
+def _load_linked_file(path: str, mtime_ns: int, size: int) -> (str, dict):
+    contents = pathlib.Path(path).open("r").read()
+    return contents, fast_loader().load(contents)
+
+
+# path -> (mtime_ns, size) of the last successful load
+_loaded_stamps = {}
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="benten-prefetch")
+
+
+# Linked files are otherwise loaded one by one as the parse reaches each step. If a
+# workflow has several files we have not loaded yet (e.g. when it is first opened)
+# we load them in parallel so the parse finds them in the cache
+def prefetch_linked_files(doc_uri: str, paths: list):
+    to_load = set()
+    for path in paths:
+        if isinstance(path, str) and urllib.parse.urlparse(path).scheme in ["file://", ""]:
+            full_path = resolve_file_path(doc_uri, path)
+            if _loaded_stamps.get(str(full_path)) != file_stamp(full_path):
+                to_load.add(full_path)
+
+    if len(to_load) < 2:
+        return
+
+    for _ in _prefetch_pool.map(_prefetch_linked_file, to_load):
+        pass
+
+
+def _prefetch_linked_file(path: pathlib.Path):
+    try:
+        if path.is_file():
+            load_linked_file(path)
+    except Exception as e:
+        # The main parse loads the file again and will flag any problem
+        logger.debug(f"Could not prefetch {path}: {e}")
+
+
 def normalized_path(doc_uri: str, path: str):
     link_url = urllib.parse.urlparse(path)
     if link_url.scheme not in ["file://", ""]:
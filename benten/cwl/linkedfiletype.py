@@ -36,6 +36,8 @@ class CWLLinkedFile(CWLBaseType):
 
         self.full_path, self._contents, self.node_dict = \
             validate_and_load_linked_file(doc_uri, self.prefix, value_range, problems)
+        if isinstance(self.full_path, pathlib.Path):
+            code_intel.add_linked_file(self.full_path)
         ln = LookupNode(loc=value_range)
         ln.intelligence_node = self
         code_intel.add_lookup_node(ln)
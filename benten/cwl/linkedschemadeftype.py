@@ -45,5 +45,6 @@ class CWLLinkedSchemaDef(CWLLinkedFile):
 
         for _type in _type_list:
             if "name" in _type:
-                name = self.prefix + "#" + _type.pop("name")
-                code_intel.type_defs[name] = _type
+                # node_dict may be shared with other documents, so we copy rather than pop
+                name = self.prefix + "#" + _type["name"]
+                code_intel.type_defs[name] = {k: v for k, v in _type.items() if k != "name"}
@@ -12,10 +12,9 @@ from .expressiontype import CWLExpression
 from ..langserver.lspobjects import Range, CompletionItem, Diagnostic, DiagnosticSeverity
 from ..code.intelligence import LookupNode
 from ..code.intelligencecontext import copy_context
-from ..code.workflow import Workflow
+from ..code.workflow import Workflow, parse_step_interface
 from .typeinference import infer_type
-from .lib import get_range_for_key, get_range_for_value
-from ..code import workflow
+from .lib import get_range_for_key, get_range_for_value, list_as_map, prefetch_linked_files
 
 import logging
 logger = logging.getLogger(__name__)
@@ -28,17 +27,34 @@ class CWLRecordType(CWLBaseType):
         self.fields = fields
         self.required_fields = set((k for k, v in self.fields.items() if v.required))
         self.all_fields = set(self.fields.keys())
+        self._key_doc_suffix = None
 
     def init(self):
         self.required_fields = set((k for k, v in self.fields.items() if v.required))
         self.all_fields = set(self.fields.keys())
+        self._key_doc_suffix = None
+
+    # The part of the key hover doc that is common to all fields. Building this for
+    # every key on every parse was a noticeable fraction of the parse time
+    def key_doc_suffix(self):
+        if self._key_doc_suffix is None:
+            self._key_doc_suffix = \
+                "\n---\n## Sibling fields\n\n```" + \
+                "\n".join(f"- {k}" for k in self.fields.keys()) + \
+                "\n```\n" + \
+                f"\n---\n## {self.name or '-'}\n\n" + (self.doc or "")
+        return self._key_doc_suffix
 
     def check(self, node, node_key: str=None, map_sp: MapSubjectPredicate=None) -> TypeCheck:
 
         if node is None:
             return TypeCheck(self, Match.No)
 
-        required_fields = self.required_fields - {map_sp.subject if map_sp else None}
+        # check is called for every candidate type of every node, so we avoid
+        # building throwaway sets where we can
+        required_fields = self.required_fields
+        if map_sp is not None and map_sp.subject in required_fields:
+            required_fields = required_fields - {map_sp.subject}
 
         if not isinstance(node, dict):
             if map_sp is not None and node_key is not None:
@@ -47,13 +63,14 @@ class CWLRecordType(CWLBaseType):
 
             return TypeCheck(cwl_type=self, match=Match.No)
 
+        # A real set: the keys view of a CommentedMap falls back to slow
+        # Python level set operations
         fields_present = set(node.keys())
         missing_fields = required_fields - fields_present
-        extra_fields = fields_present - self.all_fields
         if len(missing_fields):
             return TypeCheck(cwl_type=self,
                              match=Match.Maybe, missing_req_fields=list(missing_fields))
-        elif len(extra_fields):
+        elif not fields_present <= self.all_fields:
             return TypeCheck(cwl_type=self,
                              match=Match.Maybe)
         else:
@@ -97,6 +114,10 @@ class CWLRecordType(CWLBaseType):
 
         if self.name == "Workflow":
             intel_context.workflow = Workflow(node.get("inputs"), node.get("outputs"), node.get("steps"))
+            if len(intel_context.path) == 0:
+                code_intel.workflow = intel_context.workflow
+            _steps = list_as_map(node.get("steps"), key_field="id", problems=[])
+            prefetch_linked_files(doc_uri, [s.get("run") for s in _steps.values() if isinstance(s, dict)])
 
         for k, child_node in field_iterator:
 
@@ -110,11 +131,7 @@ class CWLRecordType(CWLBaseType):
 
                 # key completer
                 _field = self.fields.get(k)
-                _key_doc = (_field.doc or "") if _field is not None else ""
-                _key_doc += "\n---\n## Sibling fields\n\n```" + \
-                            "\n".join(f"- {k}" for k in self.fields.keys()) + \
-                            "\n```\n"
-                _key_doc += f"\n---\n## {self.name or '-'}\n\n" + (self.doc or "")
+                _key_doc = ((_field.doc or "") if _field is not None else "") + self.key_doc_suffix()
                 ln = LookupNode(loc=key_range)
                 ln.intelligence_node = IntelligenceNode(
                     completions=list(self.fields.keys()), doc=_key_doc) # self
@@ -194,7 +211,7 @@ class CWLRecordType(CWLBaseType):
                 else:
                     linked_process = child_node
 
-                step_interface = workflow.parse_step_interface(linked_process, problems)
+                step_interface = parse_step_interface(linked_process, problems)
                 step_interface.inputs.update(extra_inputs_for_when)
                 intel_context.workflow_step_intelligence.set_step_interface(step_interface)
 
@@ -230,10 +247,8 @@ class CWLFieldType(CWLBaseType):
 
 
 def _put_this_field_first(_field_iterator, field_name):
-    field_iterator = []
+    # Single pass: prepending to a list for each match is quadratic
+    first, rest = [], []
     for k, v in _field_iterator:
-        if k == field_name:
-            field_iterator = [(k, v)] + field_iterator
-        else:
-            field_iterator += [(k, v)]
-    return field_iterator
+        (first if k == field_name else rest).append((k, v))
+    return first + rest
@@ -12,24 +12,23 @@ from .importincludetype import CWLImportInclude, is_import, is_include
 def infer_type(node, allowed_types,
                key: str = None, map_sp: MapSubjectPredicate = None) -> CWLBaseType:
     type_check_results = check_types(node, allowed_types, key, map_sp)
-    for tcr in type_check_results:
-        if tcr.match == Match.Yes:
-            res = tcr.cwl_type
-            break
-    else:
-        for tcr in type_check_results:
-            if tcr.match == Match.Maybe:
-                res = tcr.cwl_type
-                break
+    res = _first_match(type_check_results, Match.Yes) or _first_match(type_check_results, Match.Maybe)
+    if res is None:
+        if len(type_check_results) == 1:
+            res = type_check_results[0].cwl_type
         else:
-            if len(type_check_results) == 1:
-                res = type_check_results[0].cwl_type
-            else:
-                res = CWLUnknownType(name="(unknown)",
-                                     expected=[tr.cwl_type.name for tr in type_check_results])
+            res = CWLUnknownType(name="(unknown)",
+                                 expected=[tr.cwl_type.name for tr in type_check_results])
     return res
 
 
+def _first_match(type_check_results, match: Match):
+    for tcr in type_check_results:
+        if tcr.match == match:
+            return tcr.cwl_type
+    return None
+
+
 def check_types(node, allowed_types, key, map_sp) -> List[TypeCheck]:
 
     type_check_results = []
@@ -1,6 +1,7 @@
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
-from typing import Dict
+import threading
+from typing import Dict, Tuple
 from enum import IntEnum
 
 from ..code.document import Document
@@ -53,6 +54,12 @@ class CWLLangServerBase:
         self.streaming = True
 
         self.open_documents: Dict[str, Document] = {}
+        # Edits that have arrived but not yet been parsed, see FileOperation
+        self.pending_updates: Dict[str, Tuple[threading.Timer, str]] = {}
+        # Serializes request handling with the debounce timer thread
+        self.lock = threading.RLock()
+        # Workflow graph last written out for each document, see DocumentSymbol
+        self.written_graphs: Dict[str, dict] = {}
         self.initialization_request_received = False
 
         self.client_capabilities = {}
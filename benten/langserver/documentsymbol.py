@@ -24,9 +24,18 @@ class DocumentSymbol(CWLLangServerBase):
         self._write_out_graph(doc)
         return doc.symbols
 
+    # The client asks for symbols far more often than the workflow structure
+    # changes, so we only write the graph out when it is different (or the file
+    # has gone missing from the scratch directory)
     def _write_out_graph(self, doc):
         graph_data_file = pathlib.Path(
             self.config.scratch_path,
             hashlib.md5(doc.doc_uri.encode()).hexdigest() + ".json")
+        if doc.doc_uri in self.written_graphs and \
+                self.written_graphs[doc.doc_uri] == doc.wf_graph and \
+                graph_data_file.exists():
+            return
+
         with graph_data_file.open("w") as f:
             json.dump(doc.wf_graph, f, indent=2)
+        self.written_graphs[doc.doc_uri] = doc.wf_graph
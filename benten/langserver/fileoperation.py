@@ -14,6 +14,12 @@ to fulfill requests is independent of whether a text document is open or closed.
 Notes:
 Multiple documents can be open at the same time. We need to keep track of this.
 
+Parsing a document is expensive, and the client sends us a didChange on every
+keystroke. We debounce these: each change restarts a timer and we only parse
+once the user has been quiet for `update_debounce_interval` seconds. Requests
+that need an up to date parse (completion, hover etc.) flush the pending
+update first.
+
 interface TextDocumentItem {
     /**
      * The text document's URI.
@@ -39,6 +45,8 @@ interface TextDocumentItem {
 """
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
+import threading
+
 from .lspobjects import to_dict, PublishDiagnosticsParams
 from .base import CWLLangServerBase
 from ..code.document import Document
@@ -46,21 +54,35 @@ from ..code.document import Document
 import logging
 logger = logging.getLogger(__name__)
 
+update_debounce_interval = 0.3  # s
+
 
 class FileOperation(CWLLangServerBase):
 
     def serve_textDocument_didOpen(self, client_query):
         params = client_query["params"]
         doc_uri = params["textDocument"]["uri"]
+        text = params["textDocument"]["text"]
+        version = params["textDocument"]["version"]
+
+        # The text we are handed now supersedes any edit still waiting on the debounce
+        self._cancel_pending_update(doc_uri)
+
+        document = self.open_documents.get(doc_uri)
+        if document is None:
+            document = Document(
+                doc_uri=doc_uri,
+                scratch_path=self.config.scratch_path,
+                text=text,
+                version=version,
+                type_dicts=self.config.lang_models)
+            self.open_documents[doc_uri] = document
+        else:
+            # Opened again without a close (it happens). If the text is the same
+            # we keep the existing parse, otherwise this parses exactly once
+            document.version = version
+            document.update(new_text=text)
 
-        document = Document(
-            doc_uri=doc_uri,
-            scratch_path=self.config.scratch_path,
-            text=params["textDocument"]["text"],
-            version=params["textDocument"]["version"],
-            type_dicts=self.config.lang_models)
-
-        self.open_documents[doc_uri] = document
         self._mark_document_issues(doc_uri)
 
     def serve_textDocument_didChange(self, client_query):
@@ -76,13 +98,49 @@ class FileOperation(CWLLangServerBase):
         if "range" in content_change or "rangeLength" in content_change:
             logger.error("Server can currently only handle full text updates")
 
-        self.open_documents[doc_uri].update(new_text=content_change["text"])
-        self._mark_document_issues(doc_uri)
+        self._schedule_update(doc_uri, content_change["text"])
 
     def serve_textDocument_didClose(self, client_query):
         params = client_query["params"]
         doc_uri = params["textDocument"]["uri"]
+        self._cancel_pending_update(doc_uri)
         self.open_documents.pop(doc_uri)
+        self.written_graphs.pop(doc_uri, None)
+
+    def _schedule_update(self, doc_uri, new_text):
+        # Trailing edge debounce: every edit restarts the timer
+        self._cancel_pending_update(doc_uri)
+        if doc_uri not in self.open_documents:
+            logger.error(f"Received change for {doc_uri}, which is not open")
+            return
+
+        timer = threading.Timer(update_debounce_interval, self._debounced_update, args=(doc_uri,))
+        timer.daemon = True
+        self.pending_updates[doc_uri] = (timer, new_text)
+        timer.start()
+
+    def _cancel_pending_update(self, doc_uri):
+        pending = self.pending_updates.pop(doc_uri, None)
+        if pending is not None:
+            pending[0].cancel()
+
+    def _debounced_update(self, doc_uri):
+        # Runs on the timer thread, so nothing upstream will log errors for us
+        try:
+            with self.lock:
+                self.flush_pending_update(doc_uri)
+        except Exception as e:
+            logger.error("Unexpected error: %s", e, exc_info=True)
+
+    def flush_pending_update(self, doc_uri):
+        pending = self.pending_updates.pop(doc_uri, None)
+        if pending is None:
+            return
+
+        timer, new_text = pending
+        timer.cancel()
+        self.open_documents[doc_uri].update(new_text=new_text)
+        self._mark_document_issues(doc_uri)
 
     def _mark_document_issues(self, doc_uri):
         document = self.open_documents[doc_uri]
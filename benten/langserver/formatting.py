@@ -1,9 +1,16 @@
 """
 textDocument/formatting
+
+We send back a single edit that only spans the lines that the formatter
+actually changed, rather than replacing the whole document. This keeps the
+client's undo history and syntax highlighting churn proportional to the
+change, and means a no-op format does not touch the document at all.
 """
 
 #  Copyright (c) 2020 Seven Bridges. See LICENSE
 
+import re
+
 from cwlformat.formatter import cwl_format
 
 from .base import CWLLangServerBase
@@ -23,7 +30,44 @@ class Formatting(CWLLangServerBase):
         if len(doc.text) == 0:
             return
 
-        lines = doc.text.splitlines()
-        _start = Position(0, 0)
-        _end = Position(len(lines), len(lines[-1]))
-        return [TextEdit(_range=Range(start=_start, end=_end), new_text=cwl_format(doc.text))]
+        text_edit = minimal_text_edit(doc.text, cwl_format(doc.text))
+        return [text_edit] if text_edit is not None else []
+
+
+# LSP positions only count \n, \r\n and \r as line breaks. str.splitlines also
+# breaks on characters like \x0c and \u2028, which would throw our line numbers off
+_lsp_line = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+\Z")
+
+
+def _split_lines(text: str):
+    return _lsp_line.findall(text)
+
+
+def minimal_text_edit(old_text: str, new_text: str):
+    old_lines = _split_lines(old_text)
+    new_lines = _split_lines(new_text)
+
+    max_common = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < max_common and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+
+    if prefix == len(old_lines) == len(new_lines):
+        return None
+
+    suffix = 0
+    while suffix < max_common - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    _start = Position(prefix, 0)
+    if suffix > 0:
+        _end = Position(len(old_lines) - suffix, 0)
+    elif old_lines and not old_lines[-1].endswith(("\n", "\r")):
+        # No common tail and no trailing newline: the edit runs to the end of the last line
+        _end = Position(len(old_lines) - 1, len(old_lines[-1]))
+    else:
+        _end = Position(len(old_lines), 0)
+
+    return TextEdit(
+        _range=Range(start=_start, end=_end),
+        new_text="".join(new_lines[prefix:len(new_lines) - suffix]))
@@ -9,7 +9,7 @@ def to_dict(v):
     if isinstance(v, LSPObject):
         return {
             k: to_dict(_v)
-            for k, _v in v.__dict__.items() if _v is not None
+            for k, _v in _fields(v) if _v is not None
         }
     elif isinstance(v, dict):
         return {
@@ -24,12 +24,24 @@ def to_dict(v):
         return v
 
 
+def _fields(v):
+    if hasattr(v, "__dict__"):
+        return v.__dict__.items()
+    return ((k, getattr(v, k)) for k in v.__slots__)
+
+
 class LSPObject:
+    __slots__ = ()
+
     def to_dict(self):
         return to_dict(self)
 
 
+# Positions and Ranges are created for every key and value in the document on
+# every parse, so we keep them small
 class Position(LSPObject):
+    __slots__ = ("line", "character")
+
     def __init__(self, line, character):
         self.line = line
         self.character = character
@@ -43,6 +55,8 @@ class Position(LSPObject):
 
 
 class Range(LSPObject):
+    __slots__ = ("start", "end")
+
     def __init__(self, start: Position, end: Position):
         self.start = start
         self.end = end
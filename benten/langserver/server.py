@@ -85,6 +85,10 @@ class LangServer(
 
         is_a_request = "id" in client_query
 
+        with self.lock:
+            self._handle(client_query, is_a_request)
+
+    def _handle(self, client_query, is_a_request):
         if self.premature_request(client_query, is_a_request):
             return
 
@@ -92,6 +96,9 @@ class LangServer(
             return
 
         try:
+            if is_a_request:
+                self._flush_for_request(client_query)
+
             response = to_dict(self._dispatch(client_query))
 
             if is_a_request:
@@ -108,6 +115,14 @@ class LangServer(
                     message=str(e.json_rpc_error.message),
                     data=e.json_rpc_error.data)
 
+    def _flush_for_request(self, client_query):
+        # Requests need to see the latest edits, so we don't wait on the debounce
+        params = client_query.get("params")
+        if isinstance(params, dict) and isinstance(params.get("textDocument"), dict):
+            doc_uri = params["textDocument"].get("uri")
+            if doc_uri is not None:
+                self.flush_pending_update(doc_uri)
+
     def premature_request(self, client_query, is_a_request):
         if not self.initialization_request_received and \
                 client_query.get("method", None) not in ["initialize", "exit"]:
@@ -137,11 +152,14 @@ class LangServer(
 
     def _dispatch(self, client_query):
         # textDocument/didOpen -> serve_textDocument_didOpen
-        method_name = "serve_" + client_query.get("method", "noMethod").replace("/", "_")
-        try:
-            f = getattr(self, method_name)
-        except AttributeError as e:
-            f = self.serve_unknown
+        method = client_query.get("method", "noMethod")
+        if method.startswith("$/") and "id" not in client_query:
+            # Protocol notifications we are free to ignore. $/cancelRequest in particular
+            # arrives all the time while typing, so we don't want to go through serve_unknown
+            return None
+
+        method_name = "serve_" + method.replace("/", "_")
+        f = getattr(self, method_name, self.serve_unknown)
         return f(client_query)
 
     @staticmethod
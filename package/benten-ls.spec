@@ -13,7 +13,7 @@ a = Analysis(['benten-ls.py'],
              pathex=[],
              binaries=binaries,
              datas=[("../benten_schemas/*", "benten_schemas")],
-             hiddenimports=[],
+             hiddenimports=["_ruamel_yaml"],
              hookspath=["."],
              runtime_hooks=[],
              excludes=[],
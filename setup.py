@@ -23,6 +23,8 @@ setup(
     python_requires='>=3.7.0',
     install_requires=[
         "ruamel.yaml == 0.16.12",
+        # ruamel.yaml only pulls this in for Python < 3.9, but we want the C loader
+        "ruamel.yaml.clib >= 0.2.2; platform_python_implementation == 'CPython'",
         "dukpy >= 0.2.2",
         "cwlformat >= 2021.1.5"
     ],
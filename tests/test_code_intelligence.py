@@ -146,6 +146,16 @@ def test_schemadef_import():
     # Hover should show contents of included file
 
 
+def test_schemadef_import_cached():
+    this_path = current_path / "cwl" / "misc" / "cl-schemadef-import.cwl"
+    doc = load(doc_path=this_path, type_dicts=type_dicts)
+    doc.update(doc.text + "\n# Force a re-parse\n")
+
+    cmpl = doc.completion(Position(4, 11))
+    assert "./paired_end_record.yml#paired_end_options" in [c.label for c in cmpl]
+    # The second load gets the linked file from the cache and should see the same types
+
+
 def test_schemadef_include():
     this_path = current_path / "cwl" / "misc" / "cl-schemadef-include.cwl"
     doc = load(doc_path=this_path, type_dicts=type_dicts)
@@ -200,3 +210,24 @@ def test_docs_on_hover():
     hov = doc.hover(Position(10, 6))
     assert "Sibling" in hov.contents.value
     assert hov.contents.kind == "markdown"
+
+
+def test_unchanged_text_is_not_reparsed():
+    doc = load(doc_path=path, type_dicts=type_dicts)
+    code_intel = doc.code_intelligence
+    doc.update(doc.text)
+    assert doc.code_intelligence is code_intel
+
+    doc.update(doc.text + "\n")
+    assert doc.code_intelligence is not code_intel
+
+    doc.update(doc.text[:-1])
+    assert doc.code_intelligence is code_intel
+    # Undo takes us back to an earlier parse
+
+
+def test_recent_parse_is_per_configuration():
+    doc = load(doc_path=path, type_dicts=type_dicts)
+    other_doc = load(doc_path=path, type_dicts=type_dicts)
+    # tests/lib.py gives each Document its own scratch path
+    assert other_doc.code_intelligence is not doc.code_intelligence
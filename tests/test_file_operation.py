@@ -0,0 +1,131 @@
+#  Copyright (c) 2019 Seven Bridges. See LICENSE
+
+import hashlib
+import pathlib
+import time
+
+import pytest
+
+import benten.configuration
+import benten.langserver.fileoperation
+from benten.langserver.server import LangServer
+
+current_path = pathlib.Path(__file__).parent
+doc_path = current_path / "cwl" / "misc" / "wf-port-completer.cwl"
+doc_uri = doc_path.absolute().as_uri()
+
+debounce_interval = 0.05
+settle_time = 0.5
+
+
+class StubConnection:
+    def __init__(self):
+        self.sent = []
+
+    def send_notification(self, method, params):
+        self.sent.append(method)
+
+    def write_response(self, _id, response):
+        self.sent.append(("response", _id))
+
+    def write_error(self, _id, code, message, data):
+        self.sent.append(("error", _id))
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(benten.langserver.fileoperation, "update_debounce_interval", debounce_interval)
+    config = benten.configuration.Configuration()
+    config.initialize()
+    conn = StubConnection()
+    ls = LangServer(conn=conn, config=config)
+    ls.handle({"id": 0, "method": "initialize", "params": {}})
+    conn.sent.clear()
+    return ls
+
+
+def did_open(ls, text):
+    ls.handle({"method": "textDocument/didOpen",
+               "params": {"textDocument": {"uri": doc_uri, "text": text, "version": 1}}})
+
+
+def did_change(ls, text):
+    ls.handle({"method": "textDocument/didChange",
+               "params": {"textDocument": {"uri": doc_uri}, "contentChanges": [{"text": text}]}})
+
+
+def test_burst_of_changes_is_parsed_once(server):
+    text = doc_path.read_text()
+    did_open(server, text)
+    server.conn.sent.clear()
+
+    for n in range(5):
+        did_change(server, text + "\n" * (n + 1))
+    assert server.conn.sent == []
+
+    time.sleep(settle_time)
+    assert server.conn.sent == ["textDocument/publishDiagnostics"]
+    assert server.open_documents[doc_uri].text == text + "\n" * 5
+
+
+def test_request_flushes_pending_change(server):
+    text = doc_path.read_text()
+    did_open(server, text)
+    server.conn.sent.clear()
+
+    did_change(server, text + "\n# An edit\n")
+    server.handle({"id": 1, "method": "textDocument/hover",
+                   "params": {"textDocument": {"uri": doc_uri}, "position": {"line": 0, "character": 0}}})
+    assert server.conn.sent == ["textDocument/publishDiagnostics", ("response", 1)]
+    assert server.open_documents[doc_uri].text == text + "\n# An edit\n"
+    assert server.pending_updates == {}
+
+
+def test_close_cancels_pending_change(server):
+    text = doc_path.read_text()
+    did_open(server, text)
+    server.conn.sent.clear()
+
+    did_change(server, text + "\n# An edit\n")
+    server.handle({"method": "textDocument/didClose", "params": {"textDocument": {"uri": doc_uri}}})
+
+    time.sleep(settle_time)
+    assert server.conn.sent == []
+    assert doc_uri not in server.open_documents
+
+
+def test_open_cancels_pending_change(server):
+    text = doc_path.read_text()
+    did_open(server, text)
+    server.conn.sent.clear()
+
+    did_change(server, text + "\n# An edit\n")
+    did_open(server, text + "\n# Opened again\n")
+
+    time.sleep(settle_time)
+    assert server.conn.sent == ["textDocument/publishDiagnostics"]
+    assert server.open_documents[doc_uri].text == text + "\n# Opened again\n"
+
+
+def test_request_with_null_params_gets_a_response(server):
+    server.handle({"id": 1, "method": "shutdown", "params": None})
+    assert server.conn.sent == [("response", 1)]
+
+
+def graph_data_file(ls):
+    return pathlib.Path(ls.config.scratch_path, hashlib.md5(doc_uri.encode()).hexdigest() + ".json")
+
+
+def test_graph_file_written_for_unparsed_document(server):
+    graph_data_file(server).unlink(missing_ok=True)
+    did_open(server, "[unbalanced: \n")
+    symbol_request = {"id": 1, "method": "textDocument/documentSymbol",
+                      "params": {"textDocument": {"uri": doc_uri}}}
+
+    server.handle(symbol_request)
+    assert graph_data_file(server).read_text() == "null"
+
+    # Rewritten if it goes missing from the scratch directory
+    graph_data_file(server).unlink()
+    server.handle(symbol_request)
+    assert graph_data_file(server).exists()
@@ -0,0 +1,55 @@
+#  Copyright (c) 2020 Seven Bridges. See LICENSE
+
+import re
+
+from benten.langserver.formatting import minimal_text_edit
+
+
+def apply_edit(text, text_edit):
+    # Positions are resolved the way an LSP client does: only \n, \r\n and \r break lines
+    lines = re.findall(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]*\Z", text)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def offset(pos):
+        return offsets[pos.line] + pos.character
+
+    start, end = offset(text_edit.range.start), offset(text_edit.range.end)
+    return text[:start] + text_edit.newText + text[end:]
+
+
+def check_edit(old_text, new_text):
+    text_edit = minimal_text_edit(old_text, new_text)
+    assert apply_edit(old_text, text_edit) == new_text
+    return text_edit
+
+
+def test_no_change():
+    assert minimal_text_edit("a: 1\nb: 2\n", "a: 1\nb: 2\n") is None
+
+
+def test_append_at_end():
+    text_edit = check_edit("a: 1\nb: 2\n", "a: 1\nb: 2\nc: 3\n")
+    assert text_edit.range.start.line == 2
+    assert text_edit.newText == "c: 3\n"
+
+
+def test_no_trailing_newline():
+    text_edit = check_edit("a: 1\nb:   2", "a: 1\nb: 2\n")
+    assert text_edit.range.start.line == 1
+    check_edit("a: 1\nb: 2\n", "a: 1\nb: 2")
+
+
+def test_crlf():
+    text_edit = check_edit("a: 1\r\nb:   2\r\nc: 3\r\n", "a: 1\r\nb: 2\r\nc: 3\r\n")
+    assert text_edit.range.start.line == 1
+    assert text_edit.range.end.line == 2
+    check_edit("a: 1\r\nb: 2\r\n", "a: 1\nb: 2\n")
+
+
+def test_non_lsp_line_separator():
+    text_edit = check_edit("# note\u2028more\nb:   1\nc: 2\n", "# note\u2028more\nb: 1\nc: 2\n")
+    assert text_edit.range.start.line == 1
+    assert text_edit.newText == "b: 1\n"
+    check_edit("a: 1\x0cb:   2\n", "a: 1\x0cb: 2\n")
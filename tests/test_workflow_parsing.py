@@ -1,8 +1,15 @@
 #  Copyright (c) 2019 Seven Bridges. See LICENSE
 
 import pathlib
+import shutil
+import tempfile
+import threading
+
+from ruamel.yaml import YAML
 
 from lib import load, load_type_dicts
+import benten.code.yaml
+from benten.cwl.lib import load_linked_file, _load_linked_file
 
 current_path = pathlib.Path(__file__).parent
 
@@ -31,3 +38,101 @@ def test_connections():
     doc = load(doc_path=path, type_dicts=load_type_dicts())
 
     assert len(doc.problems) == 0
+
+
+def test_when_inputs_added_to_step_interface():
+    path = current_path / "cwl" / "misc" / "wf-when-input.cwl"
+    doc = load(doc_path=path, type_dicts=load_type_dicts())
+    step_interface = doc.code_intelligence.workflow.get_step_intel("step1").step_interface
+    assert "new_input" in step_interface.inputs
+
+    doc.update(doc.text.replace("$(inputs.new_input)", "$(inputs.other_input)"))
+    step_interface = doc.code_intelligence.workflow.get_step_intel("step1").step_interface
+    assert "other_input" in step_interface.inputs
+    assert "new_input" not in step_interface.inputs
+
+def test_reused_parse_sees_linked_file_changes():
+    tmp_path = pathlib.Path(tempfile.mkdtemp(prefix="benten-test"))
+    for fname in ["wf-port-completer.cwl", "clt1.cwl"]:
+        shutil.copy(current_path / "cwl" / "misc" / fname, tmp_path / fname)
+
+    doc = load(doc_path=tmp_path / "wf-port-completer.cwl", type_dicts=load_type_dicts())
+    assert len(doc.problems) == 0
+
+    original_text = doc.text
+    doc.update(original_text + "\n# An edit\n")
+
+    tool_path = tmp_path / "clt1.cwl"
+    tool_path.write_text(tool_path.read_text().replace("out1:", "renamed_out1:"))
+
+    # Going back to the original text should not reuse the old parse, since clt1.cwl changed
+    doc.update(original_text)
+    assert len(doc.problems) > 0
+
+
+def test_malformed_step_source():
+    path = current_path / "cwl" / "misc" / "wf-port-completer.cwl"
+    doc = load(doc_path=path, type_dicts=load_type_dicts())
+
+    doc.update(doc.text.replace('"#step1/out1"', '"#step1/out1/extra"'))
+    assert any("no port called out1/extra" in p.message for p in doc.problems)
+
+    doc.update(doc.text.replace('"#step1/out1/extra"', '"#step1/"'))
+    assert any("Missing port name" in p.message for p in doc.problems)
+
+
+def test_unchanged_text_sees_linked_file_changes():
+    tmp_path = pathlib.Path(tempfile.mkdtemp(prefix="benten-test"))
+    for fname in ["wf-port-completer.cwl", "clt1.cwl"]:
+        shutil.copy(current_path / "cwl" / "misc" / fname, tmp_path / fname)
+
+    doc = load(doc_path=tmp_path / "wf-port-completer.cwl", type_dicts=load_type_dicts())
+    assert len(doc.problems) == 0
+
+    tool_path = tmp_path / "clt1.cwl"
+    tool_path.write_text(tool_path.read_text().replace("out1:", "renamed_out1:"))
+
+    # e.g. the client re-opens the document after the tool was edited elsewhere
+    doc.update(doc.text)
+    assert len(doc.problems) > 0
+
+
+def _write_wf_with_linked_tools(tmp_path, n_steps):
+    tool = (current_path / "cwl" / "misc" / "clt1.cwl").read_text()
+    steps = ""
+    for n in range(n_steps):
+        (tmp_path / f"clt{n}.cwl").write_text(tool)
+        steps += f"  step{n}:\n    run: clt{n}.cwl\n    in: []\n    out: [out1]\n"
+    wf_path = tmp_path / "wf.cwl"
+    wf_path.write_text(
+        "class: Workflow\ncwlVersion: v1.0\ninputs: []\noutputs: []\nsteps:\n" + steps)
+    return wf_path
+
+
+def test_parallel_linked_file_load_with_pure_python_loader(monkeypatch):
+    # Without the C loader the YAML instance is stateful and must not be shared between threads
+    monkeypatch.setattr(benten.code.yaml, "_per_thread", threading.local())
+    monkeypatch.setattr(benten.code.yaml, "YAML", lambda **kwargs: YAML(typ="safe", pure=True))
+
+    type_dicts = load_type_dicts()
+    for _ in range(5):
+        tmp_path = pathlib.Path(tempfile.mkdtemp(prefix="benten-test"))
+        doc = load(doc_path=_write_wf_with_linked_tools(tmp_path, 8), type_dicts=type_dicts)
+        wf = doc.code_intelligence.workflow
+        for n in range(8):
+            assert wf.get_step_intel(f"step{n}").step_interface.outputs == {"out1"}
+
+
+def test_failed_linked_file_load_is_not_cached():
+    tmp_path = pathlib.Path(tempfile.mkdtemp(prefix="benten-test"))
+    tool_path = tmp_path / "broken.cwl"
+    tool_path.write_text("class: CommandLineTool\ninputs: [\n")
+
+    contents, node_dict = load_linked_file(tool_path)
+    assert node_dict is None
+    assert contents == tool_path.read_text()
+
+    misses = _load_linked_file.cache_info().misses
+    _, node_dict = load_linked_file(tool_path)
+    assert node_dict is None
+    assert _load_linked_file.cache_info().misses == misses + 1